@@ -1,16 +1,370 @@
 import uncertainties as unc
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 import os
+import matplotlib
 from datetime import datetime
 
+# Em execuções sem interface gráfica (HEADLESS=1, true ou yes),
+# usa o backend Agg e salva as figuras em arquivos PNG em vez de abrir janelas
+HEADLESS = os.environ.get('HEADLESS', '').lower() in ('1', 'true', 'yes')
+if HEADLESS:
+    matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+# Número máximo de pontos desenhados por série nos gráficos (ver _reduz_pontos)
+PONTOS_GRAFICO = 4000
+
+try:
+    from numba import njit, prange
+    NUMBA_DISPONIVEL = True
+except ImportError:
+    # Sem numba, os kernels compilados rodam como Python puro e a busca com
+    # vários tamanhos de janela usa a versão vetorizada (_janelas_vetorizadas)
+    NUMBA_DISPONIVEL = False
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+    prange = range
+
+# Usa o leitor de CSV do PyArrow (multi-thread) quando instalado
+try:
+    import pyarrow
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+# Desvio padrão móvel em C para a janela fixa com amostragem uniforme, usado
+# quando numba não está instalado
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
 # a = unc.ufloat(5.67,0.12)
 # b = unc.ufloat(9.23,0.2)
 
 # result = a * b
 # print("{:.4uP}".format(result))
 
+def _colunas(df, nomes):
+    """
+    Extrai as colunas do DataFrame como arrays NumPy, uma única vez, para uso
+    nos cálculos e gráficos (evita a criação de uma Series a cada acesso).
+    Os arrays são float64 e contíguos na memória, independentemente do layout
+    interno do DataFrame, para que as reduções (cumsum, searchsorted e os
+    kernels numba) percorram os dados com passo unitário.
+    
+    Args:
+        df (pandas.DataFrame): DataFrame com os dados
+        nomes (list): Nomes das colunas a serem extraídas
+        
+    Returns:
+        dict: Dicionário {nome da coluna: numpy.ndarray}
+    """
+    return {nome: np.ascontiguousarray(df[nome].to_numpy(dtype=np.float64, na_value=np.nan))
+            for nome in nomes}
+
+def _centraliza(x):
+    """
+    Prepara uma coluna para o cálculo do desvio padrão por somas acumuladas.
+    Valores ausentes são zerados e marcados como inválidos (como em
+    pandas.Series.std, não entram no cálculo). Os dados são centrados na média
+    da série para evitar perda de precisão em S2 - S1²/n quando a média é
+    grande comparada ao desvio padrão.
+    
+    Args:
+        x (numpy.ndarray): Valores da coluna analisada
+        
+    Returns:
+        tuple: (valores centrados, máscara de valores válidos)
+    """
+    validos = ~np.isnan(x)
+    media = x[validos].mean() if validos.any() else 0.0
+    return np.where(validos, x - media, 0.0), validos
+
+def _janelas_vetorizadas(t, x, window_sizes, max_elementos=4_000_000):
+    """
+    Versão vetorizada de _busca_janelas: calcula de uma só vez o desvio padrão
+    de todas as janelas (um par tamanho x ponto inicial por elemento de uma
+    matriz) a partir das somas acumuladas de x e x². Os tamanhos são
+    processados em blocos de até max_elementos elementos para limitar a memória.
+    
+    Args:
+        t (numpy.ndarray): Tempos (X_Value), em ordem crescente
+        x (numpy.ndarray): Valores da coluna analisada
+        window_sizes (numpy.ndarray): Tamanhos de janela em segundos
+        max_elementos (int): Tamanho máximo de cada bloco da matriz
+        
+    Returns:
+        tuple: (desvios padrão mínimos, índices iniciais, índices finais),
+        um elemento por tamanho de janela
+    """
+    n_w = len(window_sizes)
+    stds_min = np.full(n_w, np.inf)
+    inicios = np.zeros(n_w, dtype=np.int64)
+    fins = np.zeros(n_w, dtype=np.int64)
+    if len(t) == 0:
+        return stds_min, inicios, fins
+    
+    x, validos = _centraliza(x)
+    
+    # Somas acumuladas com um zero inicial: soma de x[i:j+1] = c[j+1] - c[i]
+    c1 = np.concatenate(([0.0], np.cumsum(x)))
+    c2 = np.concatenate(([0.0], np.cumsum(x * x)))
+    cn = np.concatenate(([0], np.cumsum(validos)))
+    
+    i = np.arange(len(t))
+    passo = max(1, max_elementos // len(t))
+    for k0 in range(0, n_w, passo):
+        w = window_sizes[k0:k0 + passo, None]
+        
+        # Índice do último ponto dentro da janela para cada par (tamanho, início)
+        j = np.searchsorted(t, t[None, :] + w, side='right') - 1
+        
+        s1 = c1[j + 1] - c1[i]
+        s2 = c2[j + 1] - c2[i]
+        n = cn[j + 1] - cn[i]
+        
+        # Janelas com pelo menos 3 pontos e tamanho real próximo do desejado
+        # (com margem de 1%)
+        mask = ((j - i) >= 2) & (n >= 2) & (np.abs((t[j] - t) - w) <= w * 0.01)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            var = (s2 - s1 * s1 / n) / (n - 1)
+        stds = np.where(mask, np.sqrt(np.maximum(var, 0.0)), np.inf)
+        
+        # Melhor ponto inicial para cada tamanho (o primeiro, em caso de empate)
+        linhas = np.arange(len(w))
+        melhores = np.argmin(stds, axis=1)
+        stds_min[k0:k0 + passo] = stds[linhas, melhores]
+        inicios[k0:k0 + passo] = melhores
+        fins[k0:k0 + passo] = j[linhas, melhores]
+    
+    return stds_min, inicios, fins
+
+def _limite_inicios(t, window_sizes):
+    """
+    Calcula, para cada tamanho de janela, o último ponto inicial que pode ter
+    uma janela válida e se a verificação de tamanho (margem de 1%) ainda é
+    necessária. As janelas que começam perto do fim da série terminam no
+    último ponto e ficam curtas demais; como o tamanho dessas janelas só
+    diminui com o ponto inicial, as válidas formam um prefixo. Com amostragem
+    densa (maior passo de tempo até 0,5% do tamanho da janela), toda janela
+    que não termina no último ponto tem tamanho dentro da margem, e a
+    verificação pode ser omitida.
+    
+    Args:
+        t (numpy.ndarray): Tempos (X_Value), em ordem crescente
+        window_sizes (numpy.ndarray): Tamanhos de janela em segundos
+        
+    Returns:
+        tuple: (último índice inicial por tamanho, verificação necessária
+        por tamanho)
+    """
+    i_max = np.full(len(window_sizes), -1, dtype=np.int64)
+    checa_tolerancia = np.ones(len(window_sizes), dtype=np.bool_)
+    if len(t) == 0:
+        return i_max, checa_tolerancia
+    
+    passo_max = np.max(np.diff(t)) if len(t) > 1 else 0.0
+    for k, window_size in enumerate(window_sizes):
+        # Primeiro ponto inicial cuja janela termina no último ponto da série
+        i_cauda = int(np.searchsorted(t + window_size, t[-1], side='left'))
+        
+        # Mesma comparação feita nos kernels, para as janelas desse trecho
+        cauda_valida = np.abs((t[-1] - t[i_cauda:]) - window_size) <= window_size * 0.01
+        validas = np.flatnonzero(cauda_valida)
+        i_max[k] = i_cauda + validas[-1] if len(validas) else i_cauda - 1
+        checa_tolerancia[k] = passo_max > window_size * 0.005
+    
+    return i_max, checa_tolerancia
+
+@njit(cache=True)
+def _janela_min_std(t, x, validos, window_size, i_max, checa_tolerancia):
+    """
+    Encontra, para um tamanho fixo de janela, a janela com menor desvio padrão.
+    Usa dois cursores (início i e fim j) e atualiza a média e a soma dos
+    quadrados dos desvios (M2) da janela atual pelo método de Welford, de modo
+    que cada ponto entra e sai da janela uma única vez e o erro de
+    arredondamento não se acumula ao longo da série.
+    
+    Args:
+        t (numpy.ndarray): Tempos (X_Value), em ordem crescente
+        x (numpy.ndarray): Valores da coluna (ver _centraliza)
+        validos (numpy.ndarray): Máscara de valores válidos
+        window_size (float): Tamanho da janela em segundos
+        i_max (int): Último índice inicial a testar (ver _limite_inicios)
+        checa_tolerancia (bool): Se o tamanho real de cada janela deve ser
+            comparado com o desejado (ver _limite_inicios)
+        
+    Returns:
+        tuple: (desvio padrão mínimo, índice inicial, índice final)
+    """
+    # A busca compara variâncias (M2 / (n - 1)) e só calcula a raiz quadrada
+    # do melhor resultado no final
+    min_var = np.inf
+    best_i = 0
+    best_j = 0
+    
+    media = 0.0
+    m2 = 0.0
+    n = 0
+    j = -1
+    for i in range(i_max + 1):
+        # Avança o cursor final até o último ponto que está dentro da janela,
+        # incluindo os novos pontos na média e em M2
+        end_time = t[i] + window_size
+        while j + 1 < len(t) and t[j + 1] <= end_time:
+            j += 1
+            if validos[j]:
+                n += 1
+                delta = x[j] - media
+                media += delta / n
+                m2 += delta * (x[j] - media)
+        
+        # Descarta primeiro as janelas que não superam a melhor já encontrada
+        # (M2 >= variância mínima * (n - 1), sem divisão), que são a maioria;
+        # só então verifica se a janela tem pelo menos 3 pontos e, se
+        # necessário, tamanho real próximo do desejado (com margem de 1%)
+        if (n >= 2 and m2 < min_var * (n - 1) and j - i >= 2
+                and (not checa_tolerancia
+                     or abs((t[j] - t[i]) - window_size) <= window_size * 0.01)):
+            min_var = max(m2, 0.0) / (n - 1)
+            best_i = i
+            best_j = j
+        
+        # Remove o ponto inicial antes de avançar o cursor inicial
+        if validos[i]:
+            n -= 1
+            if n == 0:
+                media = 0.0
+                m2 = 0.0
+            else:
+                delta = x[i] - media
+                media -= delta / n
+                m2 -= delta * (x[i] - media)
+    
+    return np.sqrt(min_var), best_i, best_j
+
+@njit(cache=True, parallel=True)
+def _busca_janelas(t, x, validos, window_sizes, i_max, checa_tolerancia):
+    """
+    Aplica _janela_min_std a cada tamanho de janela. Os tamanhos são
+    independentes entre si e são processados em paralelo.
+    
+    Args:
+        t (numpy.ndarray): Tempos (X_Value), em ordem crescente
+        x (numpy.ndarray): Valores centrados da coluna (ver _centraliza)
+        validos (numpy.ndarray): Máscara de valores válidos
+        window_sizes (numpy.ndarray): Tamanhos de janela em segundos
+        i_max (numpy.ndarray): Último índice inicial por tamanho
+        checa_tolerancia (numpy.ndarray): Verificação de tamanho por tamanho
+        
+    Returns:
+        tuple: (desvios padrão mínimos, índices iniciais, índices finais),
+        um elemento por tamanho de janela
+    """
+    n_w = len(window_sizes)
+    stds = np.full(n_w, np.inf)
+    inicios = np.zeros(n_w, dtype=np.int64)
+    fins = np.zeros(n_w, dtype=np.int64)
+    for k in prange(n_w):
+        std_k, inicio_k, fim_k = _janela_min_std(t, x, validos, window_sizes[k],
+                                                 i_max[k], checa_tolerancia[k])
+        stds[k] = std_k
+        inicios[k] = inicio_k
+        fins[k] = fim_k
+    return stds, inicios, fins
+
+def _janela_fixa_uniforme(t, x, window_size):
+    """
+    Busca da janela fixa sem numba, para dados com amostragem uniforme (caso
+    típico dos arquivos do NI-DAQ): quando toda janela completa tem o mesmo
+    número de pontos N, o desvio padrão móvel é calculado em C por
+    bottleneck.move_std.
+    As janelas do final da série, truncadas pelo último ponto, são avaliadas
+    à parte por _janelas_vetorizadas.
+    
+    Args:
+        t (numpy.ndarray): Tempos (X_Value), em ordem crescente
+        x (numpy.ndarray): Valores da coluna analisada
+        window_size (float): Tamanho da janela em segundos
+        
+    Returns:
+        tuple: (desvio padrão mínimo, índice inicial, índice final), ou None
+        se as janelas completas não tiverem todas o mesmo número de pontos e
+        tamanho dentro da margem de 1% (nesse caso outra busca é usada)
+    """
+    if len(t) < 3:
+        return None
+    
+    # Índice do último ponto dentro da janela para cada ponto inicial, como nas
+    # demais buscas (o arredondamento de t + window_size decide o limite)
+    i = np.arange(len(t))
+    j = np.searchsorted(t, t + window_size, side='right') - 1
+    
+    # Janelas completas: as que não terminam no último ponto da série
+    inicio_cauda = int(np.searchsorted(j, len(t) - 1, side='left'))
+    if inicio_cauda == 0:
+        return None
+    
+    n_pontos = int(j[0]) + 1
+    completas = slice(0, inicio_cauda)
+    if (n_pontos < 3 or np.any(j[completas] - i[completas] != n_pontos - 1)
+            or np.any(np.abs((t[j[completas]] - t[completas]) - window_size) > window_size * 0.01)):
+        return None
+    
+    # stds[k] é o desvio padrão da janela completa que começa em k. Os dados
+    # são centrados na média para preservar a precisão
+    min_std = np.inf
+    best_i = 0
+    x_centrado = x - np.nanmean(x) if not np.isnan(x).all() else x
+    stds = bn.move_std(x_centrado, window=n_pontos, min_count=2, ddof=1)
+    stds = stds[n_pontos - 1:n_pontos - 1 + inicio_cauda]
+    if not np.isnan(stds).all():
+        best_i = int(np.nanargmin(stds))
+        min_std = stds[best_i]
+    
+    # Janelas truncadas no final da série
+    stds_cauda, inicios_cauda, fins_cauda = _janelas_vetorizadas(
+        t[inicio_cauda:], x[inicio_cauda:], np.array([window_size]))
+    if stds_cauda[0] < min_std:
+        return (stds_cauda[0], inicio_cauda + int(inicios_cauda[0]),
+                inicio_cauda + int(fins_cauda[0]))
+    
+    return min_std, best_i, best_i + n_pontos - 1
+
+def _janela_fixa(t, x, window_size):
+    """
+    Busca da janela com menor desvio padrão para um tamanho fixo, escolhendo a
+    implementação mais rápida disponível: o kernel compilado com numba (uma
+    única passada, sem arrays intermediários); sem numba, bottleneck para
+    amostragem uniforme; e, nos demais casos, a versão vetorizada.
+    
+    Args:
+        t (numpy.ndarray): Tempos (X_Value), em ordem crescente
+        x (numpy.ndarray): Valores da coluna analisada
+        window_size (float): Tamanho da janela em segundos
+        
+    Returns:
+        tuple: (desvio padrão mínimo, índice inicial, índice final)
+    """
+    if NUMBA_DISPONIVEL:
+        x_centrado, validos = _centraliza(x)
+        i_max, checa_tolerancia = _limite_inicios(t, np.array([window_size]))
+        return _janela_min_std(t, x_centrado, validos, window_size,
+                               i_max[0], checa_tolerancia[0])
+    
+    if bn is not None:
+        resultado = _janela_fixa_uniforme(t, x, window_size)
+        if resultado is not None:
+            return resultado
+    
+    stds, inicios, fins = _janelas_vetorizadas(t, x, np.array([window_size]))
+    return stds[0], int(inicios[0]), int(fins[0])
+
 def find_min_std_window(df, column_name, min_window_size, max_window_size):
     """
     Encontra a janela de tempo com menor desvio padrão para uma coluna específica,
@@ -32,77 +386,95 @@ def find_min_std_window(df, column_name, min_window_size, max_window_size):
     if min_window_size > max_window_size:
         raise ValueError("O tamanho mínimo da janela deve ser menor ou igual ao tamanho máximo")
     
-    min_std = float('inf')
-    best_start_idx = 0
-    best_end_idx = 0
-    best_window_size = 0
+    if min_window_size <= 0:
+        raise ValueError("O tamanho mínimo da janela deve ser maior que zero")
+    
+    # Extrai as colunas como arrays NumPy uma única vez (evita .iloc a cada passo)
+    arr = _colunas(df, ['X_Value', column_name])
+    t = arr['X_Value']
+    x = arr[column_name]
+    
+    # Os limites das janelas são buscados com cursores que só avançam
+    # (e com np.searchsorted), o que exige tempos em ordem crescente. A
+    # comparação com >= também rejeita tempos NaN
+    if not np.all(np.diff(t) >= 0):
+        raise ValueError("A coluna 'X_Value' deve estar em ordem crescente")
     
     # Se min = max, usa um tamanho fixo de janela
     if min_window_size == max_window_size:
-        window_size = min_window_size
-        # Percorre o DataFrame procurando a janela com menor desvio padrão
-        for i in range(len(df)):
-            # Encontra o índice final da janela que corresponde ao tempo inicial + window_size
-            start_time = df['X_Value'].iloc[i]
-            end_time = start_time + window_size
-            
-            # Encontra o índice do último ponto que está dentro da janela
-            end_idx = df[df['X_Value'] <= end_time].index[-1]
-            
-            # Se a janela não tiver o tamanho mínimo necessário, pula para o próximo ponto
-            if end_idx - i < 2:  # Pelo menos 2 pontos para calcular desvio padrão
-                continue
-                
-            # Calcula o desvio padrão para a janela atual
-            window = df[column_name].iloc[i:end_idx+1]
-            current_std = window.std()
-            
-            # Verifica se o tamanho real da janela está próximo do desejado (com margem de 1%)
-            actual_window_size = df['X_Value'].iloc[end_idx] - start_time
-            if abs(actual_window_size - window_size) > window_size * 0.01:
-                continue
-            
-            if current_std < min_std:
-                min_std = current_std
-                best_start_idx = i
-                best_end_idx = end_idx
-                best_window_size = window_size
+        window_sizes = np.array([min_window_size], dtype=np.float64)
     else:
-        # Testa diferentes tamanhos de janela
-        for window_size in np.arange(min_window_size, max_window_size + 1, 1):
-            # Percorre o DataFrame procurando a janela com menor desvio padrão
-            for i in range(len(df)):
-                # Encontra o índice final da janela que corresponde ao tempo inicial + window_size
-                start_time = df['X_Value'].iloc[i]
-                end_time = start_time + window_size
-                
-                # Encontra o índice do último ponto que está dentro da janela
-                end_idx = df[df['X_Value'] <= end_time].index[-1]
-                
-                # Se a janela não tiver o tamanho mínimo necessário, pula para o próximo ponto
-                if end_idx - i < 2:  # Pelo menos 2 pontos para calcular desvio padrão
-                    continue
-                    
-                # Calcula o desvio padrão para a janela atual
-                window = df[column_name].iloc[i:end_idx+1]
-                current_std = window.std()
-                
-                # Verifica se o tamanho real da janela está próximo do desejado (com margem de 1%)
-                actual_window_size = df['X_Value'].iloc[end_idx] - start_time
-                if abs(actual_window_size - window_size) > window_size * 0.01:
-                    continue
-                
-                if current_std < min_std:
-                    min_std = current_std
-                    best_start_idx = i
-                    best_end_idx = end_idx
-                    best_window_size = window_size
+        # Testa diferentes tamanhos de janela, de 1 em 1 segundo a partir do
+        # mínimo, sem ultrapassar o máximo. O número de tamanhos é calculado
+        # com aritmética inteira (np.arange com passo e limite em ponto
+        # flutuante pode incluir ou omitir o último valor); a pequena folga
+        # absorve erros de arredondamento em max - min
+        n_w = int(np.floor(max_window_size - min_window_size + 1e-9)) + 1
+        window_sizes = min_window_size + np.arange(n_w, dtype=np.float64)
+    
+    if len(window_sizes) == 1:
+        std, inicio, fim = _janela_fixa(t, x, window_sizes[0])
+        stds, inicios, fins = np.array([std]), np.array([inicio]), np.array([fim])
+    elif NUMBA_DISPONIVEL:
+        x_centrado, validos = _centraliza(x)
+        i_max, checa_tolerancia = _limite_inicios(t, window_sizes)
+        stds, inicios, fins = _busca_janelas(t, x_centrado, validos, window_sizes,
+                                             i_max, checa_tolerancia)
+    else:
+        stds, inicios, fins = _janelas_vetorizadas(t, x, window_sizes)
+    
+    # Em caso de empate, fica com o menor tamanho de janela
+    k = int(np.argmin(stds))
+    min_std = stds[k]
+    best_start_idx = int(inicios[k])
+    best_end_idx = int(fins[k])
+    best_window_size = window_sizes[k]
     
     if min_std == float('inf'):
         raise ValueError(f"Não foi possível encontrar uma janela válida entre {min_window_size} e {max_window_size} segundos")
     
     return best_start_idx, best_end_idx + 1, min_std, best_window_size
 
+def _le_dados(file_path, skiprows, column_names):
+    """
+    Lê o bloco de dados do arquivo. Usa o leitor multi-thread do PyArrow quando
+    disponível e recorre ao leitor C do pandas caso contrário (ou se o PyArrow
+    não conseguir interpretar o arquivo).
+    
+    Args:
+        file_path (str): Caminho para o arquivo
+        skiprows (int): Número de linhas a pular (cabeçalho e nomes das colunas)
+        column_names (list): Nomes das colunas
+        
+    Returns:
+        pandas.DataFrame: DataFrame com os dados
+    """
+    opcoes = dict(sep='\t',  # Separador é tabulação
+                  skiprows=skiprows,  # Pula as linhas do cabeçalho e a linha dos nomes
+                  decimal=',',  # Separador decimal é vírgula
+                  na_values=[''],  # Valores vazios são considerados NaN
+                  encoding='utf-8')  # Codificação do arquivo
+    
+    if CSV_ENGINE == 'pyarrow':
+        try:
+            # Mantém as colunas como arrays Arrow (sem conversão para NumPy na
+            # leitura); _colunas obtém os arrays float64 para os cálculos
+            df = pd.read_csv(file_path, header=None, engine='pyarrow',
+                             dtype_backend='pyarrow', **opcoes)
+        except ValueError:
+            df = None
+        
+        # Colunas finais sem valores (ex.: Comment) podem não aparecer nas
+        # linhas de dados; como o leitor C, completa essas colunas com NaN
+        if df is not None and df.shape[1] <= len(column_names):
+            df.columns = column_names[:df.shape[1]]
+            for nome in column_names[df.shape[1]:]:
+                df[nome] = pd.Series(None, index=df.index, dtype='float64[pyarrow]')
+            return df
+    
+    # Usa os nomes das colunas lidos do arquivo
+    return pd.read_csv(file_path, names=column_names, **opcoes)
+
 def read_file(file_path):
     """
     Lê o arquivo e retorna um DataFrame do pandas.
@@ -115,22 +487,26 @@ def read_file(file_path):
     Returns:
         tuple: (DataFrame com os dados, data do teste experimental)
     """
-    # Lê o arquivo ignorando as primeiras linhas do cabeçalho
-    # O cabeçalho termina com o segundo ***End_of_Header***
-    with open(file_path, 'r') as f:
-        lines = f.readlines()
-    
-    # Procura a data do teste experimental no cabeçalho
+    # Percorre o cabeçalho uma única vez, linha a linha, procurando a data do
+    # teste experimental e o segundo ***End_of_Header***, onde o cabeçalho termina
     data_teste = None
-    primeiro_header_end = False
+    header_count = 0
+    header_end_idx = 0
+    column_names = None
     
-    for line in lines:
-        if '***End_of_Header***' in line:
-            primeiro_header_end = True
-            continue
+    with open(file_path, 'r') as f:
+        for i, line in enumerate(f):
+            if '***End_of_Header***' in line:
+                header_count += 1
+                if header_count == 2:
+                    header_end_idx = i + 1
+                    # Lê os nomes das colunas da linha após o segundo ***End_of_Header***
+                    column_names = next(f).strip().split('\t')
+                    break
+                continue
             
-        if not primeiro_header_end:
-            if 'Date' in line:
+            # A data do teste fica antes do primeiro ***End_of_Header***
+            if header_count == 0 and 'Date' in line:
                 try:
                     # Extrai a data da linha
                     data = line.strip().split('Date')[1].strip()
@@ -141,27 +517,11 @@ def read_file(file_path):
                 except:
                     pass
     
-    # Encontra o índice onde o segundo cabeçalho termina
-    header_count = 0
-    header_end_idx = 0
-    for i, line in enumerate(lines):
-        if '***End_of_Header***' in line:
-            header_count += 1
-            if header_count == 2:
-                header_end_idx = i + 1
-                break
-    
-    # Lê os nomes das colunas da linha após o segundo ***End_of_Header***
-    column_names = lines[header_end_idx].strip().split('\t')
+    if column_names is None:
+        raise ValueError(f"Segundo ***End_of_Header*** não encontrado no arquivo '{file_path}'")
     
     # Lê os dados usando pandas, pulando as linhas do cabeçalho
-    df = pd.read_csv(file_path, 
-                     sep='\t',  # Separador é tabulação
-                     skiprows=header_end_idx+1,  # Pula as linhas do cabeçalho e a linha dos nomes
-                     decimal=',',  # Separador decimal é vírgula
-                     na_values=[''],  # Valores vazios são considerados NaN
-                     encoding='utf-8',  # Codificação do arquivo
-                     names=column_names)  # Usa os nomes das colunas lidos do arquivo
+    df = _le_dados(file_path, header_end_idx+1, column_names)
     
     return df, data_teste
 
@@ -193,6 +553,8 @@ def save_results(df, coluna_escolhida, start_idx, end_idx, min_std, media_janela
     # Obtém a data atual no formato DD/MM/AAAA
     data_atual = datetime.now().strftime('%d/%m/%Y')
     
+    t = df['X_Value'].to_numpy()
+    
     # Prepara o cabeçalho com as informações gerais
     header = [
         "***Resultados da Análise***",
@@ -205,8 +567,8 @@ def save_results(df, coluna_escolhida, start_idx, end_idx, min_std, media_janela
         f"Tamanho Ótimo da Janela: {best_window_size:.1f} segundos",
         f"Média da Janela: {media_janela:.4f}",
         f"Desvio Padrão: {min_std:.4f}",
-        f"Tempo Inicial: {df['X_Value'].iloc[start_idx]:.2f} segundos",
-        f"Tempo Final: {df['X_Value'].iloc[end_idx-1]:.2f} segundos",
+        f"Tempo Inicial: {t[start_idx]:.2f} segundos",
+        f"Tempo Final: {t[end_idx-1]:.2f} segundos",
         f"Número de Pontos: {end_idx - start_idx}",
         "***Dados da Janela***",
         "***End_of_Header***"
@@ -217,22 +579,80 @@ def save_results(df, coluna_escolhida, start_idx, end_idx, min_std, media_janela
     
     # Salva o arquivo
     with open(output_file, 'w', encoding='utf-8') as f:
-        # Escreve o cabeçalho
-        f.write('\n'.join(header))
-        f.write('\n')
-        
-        # Escreve os nomes das colunas
-        f.write('\t'.join(df.columns))
+        # Escreve o cabeçalho e os nomes das colunas de uma só vez
+        f.write('\n'.join(header + ['\t'.join(df.columns)]))
         f.write('\n')
         
-        # Escreve os dados
-        for _, row in window_data.iterrows():
-            f.write('\t'.join([f"{val:.6f}" if isinstance(val, (int, float)) else str(val) 
-                             for val in row]))
-            f.write('\n')
+        # Escreve os dados (valores ausentes como 'nan', como antes). Com todas
+        # as colunas numéricas, o bloco é gravado direto do array float64;
+        # havendo colunas de texto, to_csv mantém a ordem original das colunas,
+        # com o mesmo formato '%.6f' para as numéricas
+        if all(pd.api.types.is_numeric_dtype(dtype) for dtype in window_data.dtypes):
+            np.savetxt(f, window_data.to_numpy(dtype=np.float64, na_value=np.nan),
+                       fmt='%.6f', delimiter='\t')
+        else:
+            # to_csv só aplica float_format a colunas float: inteiros e
+            # booleanos são convertidos para sair como 1.000000/0.000000
+            window_data = window_data.astype(
+                {c: 'float64' for c in window_data.select_dtypes(['integer', 'bool'])})
+            window_data.to_csv(f, sep='\t', float_format='%.6f', na_rep='nan',
+                               index=False, header=False, lineterminator='\n')
     
     print(f"\nResultados salvos no arquivo: {output_file}")
 
+def _reduz_pontos(t, y, n_max=PONTOS_GRAFICO):
+    """
+    Reduz o número de pontos de uma série para o gráfico (a tela tem da ordem
+    de mil pixels na horizontal). A série é dividida em blocos e de cada bloco
+    são mantidos o ponto de mínimo e o de máximo, preservando picos e vales.
+    
+    Args:
+        t (numpy.ndarray): Tempos (X_Value)
+        y (numpy.ndarray): Valores da série
+        n_max (int): Número máximo aproximado de pontos
+        
+    Returns:
+        tuple: (tempos, valores) reduzidos
+    """
+    n = len(t)
+    if n <= n_max:
+        return t, y
+    
+    # Valores ausentes não são escolhidos como mínimo nem como máximo
+    y_min = np.where(np.isnan(y), np.inf, y)
+    y_max = np.where(np.isnan(y), -np.inf, y)
+    
+    # Tamanho do bloco arredondado para cima: no máximo n_max // 2 blocos
+    tam = -(-n // (n_max // 2))
+    corte = n - n % tam
+    base = np.arange(0, corte, tam)
+    indices = [base + np.argmin(y_min[:corte].reshape(-1, tam), axis=1),
+               base + np.argmax(y_max[:corte].reshape(-1, tam), axis=1),
+               [0, n - 1]]
+    
+    # Pontos que sobram no final formam um último bloco, menor
+    if corte < n:
+        indices.append([corte + np.argmin(y_min[corte:]),
+                        corte + np.argmax(y_max[corte:])])
+    
+    idx = np.unique(np.concatenate(indices))
+    return t[idx], y[idx]
+
+def _mostra_figura(fig, nome):
+    """
+    Mostra a figura na tela ou, em modo HEADLESS, salva em '<nome>.png' no
+    diretório atual.
+    
+    Args:
+        fig (matplotlib.figure.Figure): Figura a ser mostrada
+        nome (str): Nome base do arquivo de imagem
+    """
+    if HEADLESS:
+        fig.savefig(f"{nome}.png", dpi=150, bbox_inches='tight')
+        plt.close(fig)
+    else:
+        plt.show()
+
 def plot_time_series(df, colunas):
     """
     Plota as séries temporais em subplots organizados em duas colunas.
@@ -248,26 +668,32 @@ def plot_time_series(df, colunas):
     fig, axs = plt.subplots(n_linhas, n_colunas, figsize=(16, 3.8*n_linhas), constrained_layout=True)
     fig.suptitle('Séries Temporais das Variáveis', fontsize=18, y=1.03)
     
+    arr = _colunas(df, ['X_Value'] + list(colunas))
+    
+    # Mínimo e máximo de todas as colunas, calculados de uma só vez (linha 0:
+    # mínimos, linha 1: máximos), para os limites do eixo y
+    lims = df[colunas].agg(['min', 'max']).to_numpy(dtype=np.float64, na_value=np.nan)
+    
     # Plota cada série temporal
     for idx, coluna in enumerate(colunas):
         linha = idx // n_colunas
         col = idx % n_colunas
         ax = axs[linha, col] if n_linhas > 1 else axs[col]
-        ax.plot(df['X_Value'], df[coluna], 'b-', alpha=0.8)
+        ax.plot(*_reduz_pontos(arr['X_Value'], arr[coluna]), 'b-', alpha=0.8)
         ax.set_title(coluna, pad=10, fontsize=13, fontweight='bold')
         if linha == n_linhas - 1:
             ax.set_xlabel('Tempo (s)', fontsize=11)
         ax.grid(True, alpha=0.3)
         ax.tick_params(axis='both', which='major', labelsize=9)
-        y_min = df[coluna].min() * 0.99
-        y_max = df[coluna].max() * 1.01
+        y_min = lims[0, idx] * 0.99
+        y_max = lims[1, idx] * 1.01
         ax.set_ylim(y_min, y_max)
     # Remove subplots vazios se houver
     for idx in range(len(colunas), n_linhas * n_colunas):
         linha = idx // n_colunas
         col = idx % n_colunas
         fig.delaxes(axs[linha, col])
-    plt.show()
+    _mostra_figura(fig, 'series_temporais')
 
 def plot_windows(df, colunas, start_idx, end_idx, best_window_size):
     """
@@ -287,22 +713,29 @@ def plot_windows(df, colunas, start_idx, end_idx, best_window_size):
     fig, axs = plt.subplots(n_linhas, n_colunas, figsize=(16, 3.8*n_linhas), constrained_layout=True)
     fig.suptitle(f'Janelas das Variáveis (Tamanho: {best_window_size:.1f}s)', fontsize=18, y=1.03)
     
+    arr = _colunas(df, ['X_Value'] + list(colunas))
+    
+    # Mínimo e máximo de todas as colunas, calculados de uma só vez (linha 0:
+    # mínimos, linha 1: máximos), para os limites do eixo y
+    lims = df[colunas].agg(['min', 'max']).to_numpy(dtype=np.float64, na_value=np.nan)
+    t = arr['X_Value']
+    
     # Plota cada série temporal
     for idx, coluna in enumerate(colunas):
         linha = idx // n_colunas
         col = idx % n_colunas
         ax = axs[linha, col] if n_linhas > 1 else axs[col]
+        y = arr[coluna]
         
         # Plota a série temporal completa
-        ax.plot(df['X_Value'], df[coluna], 'b-', alpha=0.3, label='Série Completa')
+        ax.plot(*_reduz_pontos(t, y), 'b-', alpha=0.3, label='Série Completa')
         
         # Plota a janela
-        ax.plot(df['X_Value'].iloc[start_idx:end_idx], 
-                df[coluna].iloc[start_idx:end_idx], 
+        ax.plot(*_reduz_pontos(t[start_idx:end_idx], y[start_idx:end_idx]), 
                 'r-', alpha=0.8, label='Janela')
         
         # Adiciona a média da janela
-        media_janela = df[coluna].iloc[start_idx:end_idx].mean()
+        media_janela = np.nanmean(y[start_idx:end_idx])
         ax.axhline(y=media_janela, color='g', linestyle='--', 
                   label=f'Média: {media_janela:.4f}')
         
@@ -313,8 +746,8 @@ def plot_windows(df, colunas, start_idx, end_idx, best_window_size):
         ax.tick_params(axis='both', which='major', labelsize=9)
         
         # Ajusta os limites do eixo y para melhor visualização
-        y_min = df[coluna].min() * 0.99
-        y_max = df[coluna].max() * 1.01
+        y_min = lims[0, idx] * 0.99
+        y_max = lims[1, idx] * 1.01
         ax.set_ylim(y_min, y_max)
         
         # Adiciona legenda
@@ -326,7 +759,7 @@ def plot_windows(df, colunas, start_idx, end_idx, best_window_size):
         col = idx % n_colunas
         fig.delaxes(axs[linha, col])
     
-    plt.show()
+    _mostra_figura(fig, 'janelas')
 
 # Exemplo de uso:
 if __name__ == "__main__":
@@ -395,8 +828,13 @@ if __name__ == "__main__":
         start_idx, end_idx, min_std, best_window_size = find_min_std_window(
             df, coluna_escolhida, min_window_size, max_window_size)
         
+        # Arrays do tempo e da variável critério (evita .iloc a cada acesso)
+        arr = _colunas(df, ['X_Value', coluna_escolhida])
+        t = arr['X_Value']
+        y = arr[coluna_escolhida]
+        
         # Calcula a média para a janela encontrada
-        media_janela = df[coluna_escolhida].iloc[start_idx:end_idx].mean()
+        media_janela = np.nanmean(y[start_idx:end_idx])
         
         print(f"\nResultados para a coluna '{coluna_escolhida}':")
         if min_window_size == max_window_size:
@@ -405,8 +843,8 @@ if __name__ == "__main__":
             print(f"Tamanho ótimo da janela encontrado: {best_window_size:.1f} segundos")
         print(f"Média da janela: {media_janela:.4f}")
         print(f"Menor desvio padrão encontrado: {min_std:.4f}")
-        print(f"Tempo inicial da janela: {df['X_Value'].iloc[start_idx]:.2f} segundos")
-        print(f"Tempo final da janela: {df['X_Value'].iloc[end_idx-1]:.2f} segundos")
+        print(f"Tempo inicial da janela: {t[start_idx]:.2f} segundos")
+        print(f"Tempo final da janela: {t[end_idx-1]:.2f} segundos")
         print(f"Número de pontos na janela: {end_idx - start_idx}")
         
         # Mostra os dados da janela
@@ -418,14 +856,14 @@ if __name__ == "__main__":
                     min_window_size, max_window_size, best_window_size, file_path, data_teste)
         
         # Plota o gráfico da variável critério
-        plt.figure(figsize=(15, 8))
+        fig = plt.figure(figsize=(15, 8))
         
         # Plota a série temporal completa
-        plt.plot(df['X_Value'], df[coluna_escolhida], 'b-', 
+        plt.plot(*_reduz_pontos(t, y), 'b-', 
                 label='Série Temporal Completa', alpha=0.7)
         
         # Destaca a janela com menor desvio padrão
-        plt.axvspan(df['X_Value'].iloc[start_idx], df['X_Value'].iloc[end_idx-1], 
+        plt.axvspan(t[start_idx], t[end_idx-1], 
                    alpha=0.3, color='red', label='Janela Ótima')
         
         # Adiciona a média como uma linha horizontal na janela
@@ -445,7 +883,8 @@ if __name__ == "__main__":
         plt.legend(fontsize=10)
         
         # Ajusta os limites do eixo x para mostrar toda a série temporal
-        plt.xlim(df['X_Value'].min(), df['X_Value'].max())
+        # (X_Value é crescente: os extremos são o primeiro e o último ponto)
+        plt.xlim(t[0], t[-1])
         
         # Ajusta os limites do eixo y para melhor visualização
         y_min = df[coluna_escolhida].min() * 0.99
@@ -453,7 +892,7 @@ if __name__ == "__main__":
         plt.ylim(y_min, y_max)
         
         plt.tight_layout()
-        plt.show()
+        _mostra_figura(fig, 'serie_criterio')
         
         # Plota as janelas de todas as variáveis
         print("\nVisualizando as janelas de todas as variáveis...")
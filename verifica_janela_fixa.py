@@ -0,0 +1,67 @@
+"""
+Verificação de regressão da busca de janela fixa: compara cada implementação
+de _janela_fixa (numba, bottleneck e vetorizada) com uma busca direta, janela
+por janela, com pd.Series.std(), em eixos de tempo construídos por soma
+acumulada, arredondados e com ruído de relógio.
+
+Uso: python verifica_janela_fixa.py
+"""
+import numpy as np
+import pandas as pd
+import exp_unc
+
+def _referencia(t, x, window_size):
+    """
+    Busca direta, como o laço original de find_min_std_window.
+    """
+    serie = pd.Series(x)
+    min_std = np.inf
+    best = (0, 0)
+    for i in range(len(t)):
+        end_idx = int(np.nonzero(t <= t[i] + window_size)[0][-1])
+        if end_idx - i < 2:
+            continue
+        current_std = serie.iloc[i:end_idx + 1].std()
+        if abs((t[end_idx] - t[i]) - window_size) > window_size * 0.01:
+            continue
+        if current_std < min_std:
+            min_std = current_std
+            best = (i, end_idx)
+    return min_std, best[0], best[1]
+
+def _implementacoes():
+    """
+    Configurações do módulo que levam _janela_fixa a cada implementação.
+    """
+    configuracoes = [('numba', exp_unc.NUMBA_DISPONIVEL, exp_unc.bn)]
+    if exp_unc.bn is not None:
+        configuracoes.append(('bottleneck', False, exp_unc.bn))
+    configuracoes.append(('vetorizada', False, None))
+    return configuracoes
+
+def main():
+    rng = np.random.default_rng(0)
+    eixos = {
+        'soma acumulada': np.cumsum(np.full(300, 0.2)),
+        'arredondado': np.round(np.arange(300) * 0.2, 10),
+        'ruído de relógio': np.sort(np.arange(300) * 0.2 + rng.uniform(-1e-6, 1e-6, 300)),
+    }
+    numba_original, bn_original = exp_unc.NUMBA_DISPONIVEL, exp_unc.bn
+    try:
+        for nome_eixo, t in eixos.items():
+            x = 1e6 + rng.normal(size=len(t))
+            x[rng.choice(len(t), 5, replace=False)] = np.nan
+            for window_size in [0.4, 1.0, 2.2, 5.0, 30.0]:
+                esperado = _referencia(t, x, window_size)
+                for nome, numba_disponivel, bn in _implementacoes():
+                    exp_unc.NUMBA_DISPONIVEL, exp_unc.bn = numba_disponivel, bn
+                    obtido = exp_unc._janela_fixa(t, x, window_size)
+                    contexto = (nome, nome_eixo, window_size, obtido, esperado)
+                    assert tuple(obtido[1:]) == esperado[1:], contexto
+                    assert np.isclose(obtido[0], esperado[0]), contexto
+    finally:
+        exp_unc.NUMBA_DISPONIVEL, exp_unc.bn = numba_original, bn_original
+    print("OK")
+
+if __name__ == "__main__":
+    main()